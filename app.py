@@ -1,172 +1,29 @@
 # -*- coding: utf-8 -*-
 """
 Hytale — перевод модов. Одно окно, запоминание папки, поиск/фильтр, пакетный перевод, память переводов.
+Логика перевода без GUI — в core.py.
 """
-import json
 import os
+import queue
 import shutil
-import sys
-import time
+import threading
 import webbrowser
 import customtkinter as ctk
 from pathlib import Path
+from typing import Callable
 from tkinter import messagebox, filedialog
+import core
 import mod_manager as mm
 import translation_manager as tm
 
 GITHUB_URL = "https://github.com/PraporAR-web"
 
-
-def _get_base_path() -> Path:
-    if getattr(sys, "frozen", False):
-        return Path(sys.executable).resolve().parent
-    return Path(__file__).resolve().parent
-
-
-CONFIG_PATH = _get_base_path() / "app_config.json"
-
-
-def _load_config() -> dict:
-    if CONFIG_PATH.exists():
-        try:
-            return json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-        except Exception:
-            pass
-    return {}
-
-
-def _save_config(data: dict) -> None:
-    try:
-        CONFIG_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    except Exception:
-        pass
-
-
-def _translation_memory_path(mods_path: Path) -> Path:
-    return mods_path / "translation_memory.json"
-
-
-def _load_translation_memory(mods_path: Path) -> dict[str, str]:
-    p = _translation_memory_path(mods_path)
-    if p.exists():
-        try:
-            return json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
-            pass
-    return {}
-
-
-def _save_translation_memory(mods_path: Path, memory: dict[str, str]) -> None:
-    try:
-        _translation_memory_path(mods_path).write_text(
-            json.dumps(memory, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
-    except Exception:
-        pass
-
-
-def _basic_translate(text: str, source_lang: str = "en", target_lang: str = "ru") -> tuple[str | None, str | None]:
-    """Базовый перевод без обработки тегов."""
-    text = (text or "").strip()
-    if not text:
-        return None, None
-    if len(text) > 4500:
-        text = text[:4500]
-    err = None
-    try:
-        from deep_translator import GoogleTranslator
-        out = GoogleTranslator(source=source_lang, target=target_lang).translate(text)
-        if out and out.strip():
-            return out.strip(), None
-    except Exception as e:
-        err = str(e)
-    try:
-        from deep_translator import GoogleTranslator
-        out = GoogleTranslator(source="auto", target=target_lang).translate(text)
-        if out and out.strip():
-            return out.strip(), None
-    except Exception as e:
-        if not err:
-            err = str(e)
-    text_short = text[:500] if len(text) > 500 else text
-    try:
-        from deep_translator import MyMemoryTranslator
-        out = MyMemoryTranslator(source=source_lang, target=target_lang).translate(text_short)
-        if out and out.strip():
-            return out.strip(), None
-    except Exception as e:
-        if not err:
-            err = str(e)
-    try:
-        from deep_translator import MyMemoryTranslator
-        out = MyMemoryTranslator(source="auto", target=target_lang).translate(text_short)
-        if out and out.strip():
-            return out.strip(), None
-    except Exception as e:
-        if not err:
-            err = str(e)
-    return None, err
-
-
-# Глобальный кэш сегментов для ускорения перевода
-_segment_cache: dict[str, str] = {}
-
-
-def _auto_translate(text: str, source_lang: str = "en", target_lang: str = "ru", 
-                    memory: dict[str, str] | None = None) -> tuple[str | None, str | None]:
-    """
-    Умный перевод с сохранением тегов <color>, <item>, [TMP], \\n и т.д.
-    Теги остаются на месте, переводится только текст между ними.
-    
-    memory — словарь памяти переводов для кэширования.
-    """
-    text = (text or "").strip()
-    if not text:
-        return None, None
-    
-    # Сначала проверяем полное совпадение в памяти
-    if memory and text in memory:
-        return memory[text], None
-    
-    # Проверяем, есть ли разметка
-    if tm.has_markup(text):
-        # Умный перевод с сохранением тегов и кэшированием сегментов
-        def translate_segment(seg: str) -> tuple[str | None, str | None]:
-            seg_clean = seg.strip()
-            if not seg_clean:
-                return seg, None
-            # Проверяем кэш сегментов
-            if seg_clean in _segment_cache:
-                return _segment_cache[seg_clean], None
-            # Проверяем память
-            if memory and seg_clean in memory:
-                _segment_cache[seg_clean] = memory[seg_clean]
-                return memory[seg_clean], None
-            # Переводим
-            tr, err = _basic_translate(seg_clean, source_lang, target_lang)
-            if tr:
-                _segment_cache[seg_clean] = tr
-                if memory is not None:
-                    memory[seg_clean] = tr
-            return tr, err
-        
-        result, err = tm.smart_translate(text, translate_segment)
-        # Сохраняем полный перевод в память
-        if result and memory is not None:
-            memory[text] = result
-        return result, err
-    else:
-        # Обычный перевод
-        result, err = _basic_translate(text, source_lang, target_lang)
-        if result and memory is not None:
-            memory[text] = result
-        return result, err
-
-
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 SIZE_LIST = (720, 560)
 SIZE_TRANSLATE = (1020, 720)
+# Высота строки в списке перевода (рамка 40 + отступ)
+ROW_HEIGHT = 44
 
 
 class App(ctk.CTk):
@@ -175,21 +32,31 @@ class App(ctk.CTk):
         self.title("Hytale — перевод модов")
         self.geometry(f"{SIZE_LIST[0]}x{SIZE_LIST[1]}")
         self.minsize(560, 420)
-        cfg = _load_config()
+        cfg = core.load_config()
         self.mods_path = Path(cfg.get("mods_path", str(mm.get_mods_folder())))
         if not self.mods_path.is_dir():
             self.mods_path = mm.get_mods_folder()
-        self.mod_rows: list[ctk.CTkFrame] = []
-        self.extracted_rows: list[ctk.CTkFrame] = []
+        # Пулы строк списков модов: (рамка, подпись, кнопка), переиспользуются при обновлении
+        self.mod_rows: list[tuple[ctk.CTkFrame, ctk.CTkLabel, ctk.CTkButton]] = []
+        self.extracted_rows: list[tuple[ctk.CTkFrame, ctk.CTkLabel, ctk.CTkButton]] = []
         self._translate_mod: dict | None = None
         self._translate_extracted_path: Path | None = None
         self._translate_rows: list[dict] = []
-        self._translate_entries: list[ctk.CTkEntry] = []
-        self._translate_row_frames: list[ctk.CTkFrame] = []
+        # Список перевода виртуальный: виджеты есть только для видимых строк (пул), данные — в _translate_rows
+        self._visible_rows: list[int] = []
+        self._row_pool: list[dict] = []
+        self._filter_job: str | None = None
+        self._filled_count = 0
         self._translate_source_lang = "en"
         self._translate_target_lang = "ru"
         self._translate_cleanup_after_pack = ctk.BooleanVar(value=False)
         self._batch_cancelled = False
+        self._batch_thread: threading.Thread | None = None
+        self._batch_queue: queue.Queue = queue.Queue()
+        # «Перевести все» в окне перевода — тоже в фоновом потоке, события через очередь
+        self._translate_thread: threading.Thread | None = None
+        self._translate_queue: queue.Queue = queue.Queue()
+        self._memory: core.TranslationMemory | None = None
 
         # --- Верхняя панель ---
         self.top_bar = ctk.CTkFrame(self, fg_color="transparent", height=44)
@@ -201,7 +68,7 @@ class App(ctk.CTk):
         ctk.CTkButton(self.top_bar, text="Открыть папку", width=100, fg_color="transparent", command=self._open_mods_folder).pack(side="right", padx=4)
         ctk.CTkButton(self.top_bar, text="Помощь", width=60, fg_color="transparent", command=self._show_help).pack(side="right", padx=4)
         ctk.CTkButton(self.top_bar, text="Выбрать…", width=90, command=self._pick_folder).pack(side="right", padx=4)
-        ctk.CTkButton(self.top_bar, text="Обновить", width=80, command=self._refresh_list).pack(side="right")
+        ctk.CTkButton(self.top_bar, text="Обновить", width=80, command=lambda: self._refresh_list(force=True)).pack(side="right")
 
         # --- Контент ---
         self.content = ctk.CTkFrame(self, fg_color="transparent")
@@ -219,7 +86,13 @@ class App(ctk.CTk):
                      font=("", 11), text_color=("gray50", "gray70")).pack(anchor="w", pady=(0, 4))
         batch_f = ctk.CTkFrame(mods_tab, fg_color="transparent")
         batch_f.pack(fill="x", pady=(0, 6))
-        ctk.CTkButton(batch_f, text="Пакетный перевод (все моды)", width=180, command=self._batch_translate).pack(side="left", padx=(0, 8))
+        self.btn_batch = ctk.CTkButton(batch_f, text="Пакетный перевод (все моды)", width=180, command=self._batch_translate)
+        self.btn_batch.pack(side="left", padx=(0, 8))
+        self.btn_batch_cancel = ctk.CTkButton(batch_f, text="Отмена", width=80, fg_color="transparent",
+                                              state="disabled", command=self._cancel_batch)
+        self.btn_batch_cancel.pack(side="left", padx=(0, 8))
+        self.batch_label = ctk.CTkLabel(batch_f, text="", font=("", 11), text_color=("gray50", "gray70"))
+        self.batch_label.pack(side="left", padx=(4, 0))
         self.mods_container = ctk.CTkScrollableFrame(mods_tab, fg_color="transparent")
         self.mods_container.pack(fill="both", expand=True, pady=4)
         ctk.CTkLabel(ext_tab, text="Уже распакованные моды — можно снова открыть перевод.",
@@ -249,25 +122,37 @@ class App(ctk.CTk):
         self.combo_target = ctk.CTkComboBox(trans_toolbar, values=["ru"], width=50, command=lambda x: setattr(self, "_translate_target_lang", x))
         self.combo_target.pack(side="left", padx=(0, 12))
         ctk.CTkButton(trans_toolbar, text="Загрузить строки", width=120, command=self._load_strings).pack(side="left", padx=(0, 6))
-        ctk.CTkButton(trans_toolbar, text="Перевести все", width=110, command=self._translate_all).pack(side="left", padx=(0, 6))
-        ctk.CTkButton(trans_toolbar, text="Повторить неудачные", width=140, command=self._translate_all).pack(side="left", padx=(0, 6))
+        self.btn_translate_all = ctk.CTkButton(trans_toolbar, text="Перевести все", width=110, command=self._translate_all)
+        self.btn_translate_all.pack(side="left", padx=(0, 6))
+        self.btn_translate_retry = ctk.CTkButton(trans_toolbar, text="Повторить неудачные", width=140, command=self._translate_all)
+        self.btn_translate_retry.pack(side="left", padx=(0, 6))
         ctk.CTkButton(trans_toolbar, text="Сохранить и собрать", width=150, command=self._save_and_pack).pack(side="left", padx=(0, 12))
         ctk.CTkCheckBox(trans_toolbar, text="Удалить распакованную папку после сборки", variable=self._translate_cleanup_after_pack, width=260).pack(side="left")
         trans_filter = ctk.CTkFrame(self.frame_translate, fg_color="transparent")
         trans_filter.pack(fill="x", pady=(0, 4))
         ctk.CTkLabel(trans_filter, text="Поиск:").pack(side="left", padx=(0, 6))
         self.search_var = ctk.StringVar()
-        self.search_var.trace_add("write", lambda *a: self._apply_search_filter())
+        self.search_var.trace_add("write", self._schedule_filter)
         self.entry_search = ctk.CTkEntry(trans_filter, width=200, placeholder_text="по исходному тексту или переводу", textvariable=self.search_var)
         self.entry_search.pack(side="left", padx=(0, 12))
         self.filter_untranslated_var = ctk.BooleanVar(value=False)
         ctk.CTkCheckBox(trans_filter, text="Только без перевода", variable=self.filter_untranslated_var, command=self._apply_search_filter).pack(side="left", padx=(0, 8))
         self.progress_label = ctk.CTkLabel(trans_filter, text="", font=("", 11), text_color=("gray50", "gray70"))
         self.progress_label.pack(side="left", padx=(12, 0))
-        self.translate_scroll = ctk.CTkScrollableFrame(self.frame_translate, fg_color="transparent")
-        self.translate_scroll.pack(fill="both", expand=True)
-        ctk.CTkLabel(self.translate_scroll, text="Нажмите «Загрузить строки» — список текстов подгрузится, совпадения из памяти переводов подставятся автоматически.",
-                     text_color=("gray50", "gray70")).pack(anchor="w")
+        self.translate_info = ctk.CTkLabel(self.frame_translate, text="Нажмите «Загрузить строки» — список текстов подгрузится, совпадения из памяти переводов подставятся автоматически.",
+                                           font=("", 11), text_color=("gray50", "gray70"))
+        self.translate_info.pack(anchor="w", pady=(0, 4))
+        trans_list = ctk.CTkFrame(self.frame_translate, fg_color="transparent")
+        trans_list.pack(fill="both", expand=True)
+        self.translate_scrollbar = ctk.CTkScrollbar(trans_list)
+        self.translate_scrollbar.pack(side="right", fill="y")
+        self.translate_canvas = ctk.CTkCanvas(trans_list, highlightthickness=0, yscrollincrement=ROW_HEIGHT,
+                                              bg=self._apply_appearance_mode(self.cget("fg_color")))
+        self.translate_canvas.pack(side="left", fill="both", expand=True)
+        self.translate_canvas.configure(yscrollcommand=self._on_translate_yview)
+        self.translate_scrollbar.configure(command=self.translate_canvas.yview)
+        self.translate_canvas.bind("<Configure>", self._on_translate_canvas_resize)
+        self._bind_translate_wheel(self.translate_canvas)
 
         self.frame_list.pack(fill="both", expand=True)
         self._refresh_list()
@@ -291,7 +176,7 @@ class App(ctk.CTk):
             messagebox.showinfo("Папка", str(self._translate_extracted_path))
 
     def _save_mods_path(self):
-        _save_config({"mods_path": str(self.mods_path)})
+        core.save_config({"mods_path": str(self.mods_path)})
 
     def _show_help(self):
         w = ctk.CTkToplevel(self)
@@ -309,7 +194,7 @@ class App(ctk.CTk):
 
 2. Список модов
    • Вкладка «Моды (JAR/ZIP)» — архивы модов. «Перевести» — открыть панель перевода для одного мода.
-   • «Пакетный перевод» — по очереди: распаковка, автоперевод, сохранение и сборка _rus для каждого мода в списке.
+   • «Пакетный перевод» — по очереди: распаковка, автоперевод, сохранение и сборка _rus для каждого мода в списке. Идёт в фоне, окно не зависает; «Отмена» — остановить.
    • Вкладка «Распакованные» — моды из mods/.extracted/. Можно снова открыть перевод.
 
 3. Панель перевода
@@ -323,7 +208,7 @@ class App(ctk.CTk):
    • «Открыть папку мода» — открыть распакованную папку в проводнике.
 
 4. Память переводов
-   • В папке модов создаётся файл translation_memory.json. При загрузке строк совпадающие фразы подставляются из памяти.
+   • В папке модов создаётся база tm.sqlite (старый translation_memory.json переносится в неё автоматически). При загрузке строк совпадающие фразы подставляются из памяти.
    • При сохранении и сборке новые переводы добавляются в память. Так повторяющиеся фразы в разных модах переводятся один раз.
 
 5. «← К списку модов» — вернуться к списку.
@@ -335,6 +220,12 @@ class App(ctk.CTk):
         link.bind("<Button-1>", lambda e: webbrowser.open(GITHUB_URL))
         ctk.CTkButton(w, text="Закрыть", width=100, command=w.destroy).pack(pady=(0, 12))
 
+    def _get_memory(self) -> core.TranslationMemory:
+        """Память переводов текущей папки модов: читается с диска один раз и переиспользуется."""
+        if self._memory is None or self._memory.path != core.translation_memory_path(self.mods_path):
+            self._memory = core.TranslationMemory(self.mods_path)
+        return self._memory
+
     def _pick_folder(self):
         path = filedialog.askdirectory(initialdir=str(self.mods_path))
         if path:
@@ -343,96 +234,223 @@ class App(ctk.CTk):
             self._save_mods_path()
             self._refresh_list()
 
+    def _schedule_filter(self, *_):
+        """Фильтр применяется через 150 мс после последнего нажатия, а не на каждую букву."""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(150, self._apply_search_filter)
+
     def _apply_search_filter(self):
-        if not self._translate_rows or len(self._translate_entries) != len(self._translate_rows):
-            return
+        """Фильтр — обычный проход по _translate_rows; виджеты не трогаем, только перерисовываем видимое окно."""
+        self._filter_job = None
         q = (self.search_var.get() or "").strip().lower()
         only_empty = self.filter_untranslated_var.get()
-        for i, (r, e, frame) in enumerate(zip(self._translate_rows, self._translate_entries, self._translate_row_frames)):
-            src = (r.get("source") or "").lower()
-            tr = (e.get() or "").lower()
-            show = True
-            if q and q not in src and q not in tr:
-                show = False
-            if only_empty and (e.get() or "").strip():
-                show = False
-            if show:
-                frame.pack(fill="x", pady=2)
-            else:
-                frame.pack_forget()
+        visible = []
+        for i, r in enumerate(self._translate_rows):
+            tr = r.get("translated") or ""
+            if q and q not in r["src_lower"] and q not in tr.lower():
+                continue
+            if only_empty and tr.strip():
+                continue
+            visible.append(i)
+        self._visible_rows = visible
+        self.translate_canvas.configure(scrollregion=(0, 0, 0, len(visible) * ROW_HEIGHT))
+        self.translate_canvas.yview_moveto(0)
+        self._render_translate_rows(force=True)
+        self._update_progress_label()
+
+    def _recount_filled(self):
+        """Полный пересчёт заполненных строк — после загрузки и массового перевода."""
+        self._filled_count = 0
+        for r in self._translate_rows:
+            r["filled"] = bool((r.get("translated") or "").strip())
+            self._filled_count += r["filled"]
         self._update_progress_label()
 
+    def _on_entry_key(self, slot: dict):
+        """Текст поля сразу пишется в строку; счётчик меняется на ±1 без обхода всех строк."""
+        if slot["row"] is None:
+            return
+        r = self._translate_rows[slot["row"]]
+        r["translated"] = slot["entry"].get() or ""
+        filled = bool(r["translated"].strip())
+        if filled != r["filled"]:
+            r["filled"] = filled
+            self._filled_count += 1 if filled else -1
+            self._update_progress_label()
+
+    # --- Виртуальный список строк перевода ---
+    def _bind_translate_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_translate_wheel)
+        widget.bind("<Button-4>", self._on_translate_wheel)
+        widget.bind("<Button-5>", self._on_translate_wheel)
+
+    def _on_translate_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            step = -3
+        else:
+            step = 3
+        self.translate_canvas.yview_scroll(step, "units")
+
+    def _on_translate_yview(self, first, last):
+        self.translate_scrollbar.set(first, last)
+        self._render_translate_rows()
+
+    def _on_translate_canvas_resize(self, event):
+        need = event.height // ROW_HEIGHT + 2
+        while len(self._row_pool) < need:
+            self._row_pool.append(self._make_row_slot())
+        for slot in self._row_pool:
+            self.translate_canvas.itemconfigure(slot["item"], width=event.width)
+        self._render_translate_rows(force=True)
+
+    def _make_row_slot(self) -> dict:
+        """Одна строка пула: рамка с подписью и полем, переиспользуется при прокрутке."""
+        row_f = ctk.CTkFrame(self.translate_canvas, fg_color=("gray92", "gray28"), corner_radius=6, height=40)
+        row_f.pack_propagate(False)
+        row_f_inner = ctk.CTkFrame(row_f, fg_color="transparent")
+        row_f_inner.pack(fill="both", expand=True, padx=10, pady=6)
+        label = ctk.CTkLabel(row_f_inner, text="", width=360, anchor="w", wraplength=350)
+        label.pack(side="left", padx=(0, 10))
+        e = ctk.CTkEntry(row_f_inner, width=380, placeholder_text="перевод", height=28)
+        e.pack(side="left", fill="x", expand=True, padx=4)
+        item = self.translate_canvas.create_window(0, 0, window=row_f, anchor="nw", height=ROW_HEIGHT - 4,
+                                                   width=self.translate_canvas.winfo_width(), state="hidden")
+        slot = {"frame": row_f, "label": label, "entry": e, "item": item, "row": None}
+        e.bind("<KeyRelease>", lambda _e, s=slot: self._on_entry_key(s))
+        e.bind("<FocusOut>", lambda _e, s=slot: self._on_entry_key(s))
+        for w in (row_f, row_f_inner, label, e):
+            self._bind_translate_wheel(w)
+        return slot
+
+    def _render_translate_rows(self, force: bool = False):
+        """Раскладывает пул виджетов по видимым строкам; force — перечитать тексты из _translate_rows."""
+        first = max(0, int(self.translate_canvas.canvasy(0)) // ROW_HEIGHT)
+        for j, slot in enumerate(self._row_pool):
+            pos = first + j
+            if pos >= len(self._visible_rows):
+                self.translate_canvas.itemconfigure(slot["item"], state="hidden")
+                slot["row"] = None
+                continue
+            ri = self._visible_rows[pos]
+            self.translate_canvas.coords(slot["item"], 0, pos * ROW_HEIGHT)
+            self.translate_canvas.itemconfigure(slot["item"], state="normal")
+            if slot["row"] == ri and not force:
+                continue
+            slot["row"] = ri
+            r = self._translate_rows[ri]
+            src = r.get("source") or ""
+            slot["label"].configure(text=src[:55] + ("…" if len(src) > 55 else ""))
+            e = slot["entry"]
+            e.delete(0, "end")
+            if r.get("translated"):
+                e.insert(0, r["translated"])
+
     def _update_progress_label(self):
         if not self._translate_rows:
             self.progress_label.configure(text="")
             return
-        total = len(self._translate_rows)
-        filled = sum(1 for e in self._translate_entries if (e.get() or "").strip())
-        self.progress_label.configure(text=f"Заполнено: {filled} / {total}")
-
-    def _refresh_list(self):
-        for r in self.mod_rows:
-            r.destroy()
-        self.mod_rows.clear()
-        for r in self.extracted_rows:
-            r.destroy()
-        self.extracted_rows.clear()
-        for mod in mm.scan_mods(self.mods_path):
-            row = ctk.CTkFrame(self.mods_container, fg_color="transparent")
-            row.pack(fill="x", pady=4)
-            ctk.CTkLabel(row, text=mod["name"], width=320, anchor="w").pack(side="left", padx=(0, 12))
-            ctk.CTkButton(row, text="Перевести", width=100, command=lambda m=mod: self._open_translate(m, None)).pack(side="left", padx=4)
-            self.mod_rows.append(row)
-        for ext in mm.get_extracted_mods(self.mods_path):
-            row = ctk.CTkFrame(self.ext_container, fg_color="transparent")
-            row.pack(fill="x", pady=4)
-            ctk.CTkLabel(row, text=ext["name"], width=320, anchor="w").pack(side="left", padx=(0, 12))
-            ctk.CTkButton(row, text="Перевести", width=100, command=lambda e=ext: self._open_translate_extracted(e)).pack(side="left", padx=4)
-            self.extracted_rows.append(row)
+        self.progress_label.configure(text=f"Заполнено: {self._filled_count} / {len(self._translate_rows)}")
+
+    def _refresh_list(self, force: bool = False):
+        mods = mm.scan_mods(self.mods_path, use_cache=not force)
+        self._fill_row_pool(self.mod_rows, self.mods_container,
+                            [(mod["name"], lambda m=mod: self._open_translate(m, None)) for mod in mods])
+        self._fill_row_pool(self.extracted_rows, self.ext_container,
+                            [(ext["name"], lambda e=ext: self._open_translate_extracted(e))
+                             for ext in mm.get_extracted_mods(self.mods_path)])
+
+    def _fill_row_pool(self, pool: list, container: ctk.CTkScrollableFrame, items: list[tuple[str, Callable]]):
+        """Перенастраивает существующие строки списка под items, недостающие создаёт, лишние скрывает."""
+        while len(pool) < len(items):
+            row = ctk.CTkFrame(container, fg_color="transparent")
+            label = ctk.CTkLabel(row, text="", width=320, anchor="w")
+            label.pack(side="left", padx=(0, 12))
+            btn = ctk.CTkButton(row, text="Перевести", width=100)
+            btn.pack(side="left", padx=4)
+            pool.append((row, label, btn))
+        for i, (row, label, btn) in enumerate(pool):
+            if i < len(items):
+                text, command = items[i]
+                label.configure(text=text)
+                btn.configure(command=command)
+                if not row.winfo_manager():
+                    row.pack(fill="x", pady=4)
+            elif row.winfo_manager():
+                row.pack_forget()
 
     def _batch_translate(self):
+        if self._batch_thread and self._batch_thread.is_alive():
+            return
         mods = mm.scan_mods(self.mods_path)
         if not mods:
             messagebox.showinfo("Пакетный перевод", "Нет модов в папке.")
             return
         if not messagebox.askyesno("Пакетный перевод", f"Перевести все {len(mods)} модов?\nДля каждого: распаковка → автоперевод → сохранение и сборка _rus."):
             return
-        try:
-            from deep_translator import GoogleTranslator
-        except ImportError:
+        if not core.translator_available():
             messagebox.showerror("Ошибка", "Установите: pip install deep-translator")
             return
         self._batch_cancelled = False
+        self.btn_batch.configure(state="disabled")
+        self.btn_batch_cancel.configure(state="normal")
+        self.batch_label.configure(text=f"Распаковка: 0 / {len(mods)}")
+        self._batch_queue = queue.Queue()
+        self._batch_thread = threading.Thread(target=self._batch_worker, args=(mods, self._get_memory(), self._batch_queue),
+                                              daemon=True)
+        self._batch_thread.start()
+        self.after(100, self._drain_batch_queue)
+
+    def _cancel_batch(self):
+        self._batch_cancelled = True
+        self.btn_batch_cancel.configure(state="disabled")
+        self.batch_label.configure(text="Отмена…")
+
+    def _batch_worker(self, mods: list[dict], memory: core.TranslationMemory, q: queue.Queue):
+        """
+        Пакетный перевод в фоновом потоке. Виджеты здесь не трогаем —
+        события уходят в очередь: ("progress", i, n), ("translate", i, n),
+        ("done", имя, успех), ("error", имя, текст), ("finished", ok, fail).
+        """
         ok, fail = 0, 0
-        for mod in mods:
-            if self._batch_cancelled:
-                break
+        try:
+            ok, fail = core.batch_translate(self.mods_path, mods, memory, emit=q.put,
+                                            cancelled=lambda: self._batch_cancelled)
+        finally:
+            q.put(("finished", ok, fail))
+
+    def _drain_batch_queue(self):
+        """
+        Забирает события фонового пакетного перевода и обновляет интерфейс (только из главного потока).
+        За один проход подпись меняется один раз — по последнему событию.
+        """
+        text = None
+        while True:
             try:
-                extracted = mm.extract_mod(mod["path"], self.mods_path, mod["name"])
-                rows = tm.collect_all_strings(extracted)
-                memory = _load_translation_memory(self.mods_path)
-                for r in rows:
-                    if r["source"] in memory:
-                        r["translated"] = memory[r["source"]]
-                need_tr = [r for r in rows if not (r.get("translated") or "").strip()]
-                for r in need_tr:
-                    tr, _ = _auto_translate(r["source"], "en", "ru", memory=memory)
-                    if tr:
-                        r["translated"] = tr
-                    time.sleep(0.15)
-                for r in rows:
-                    if (r.get("translated") or "").strip():
-                        memory[r["source"]] = r["translated"]
-                _save_translation_memory(self.mods_path, memory)
-                tm.save_all_translations(extracted, rows)
-                out_path = mod["path"].parent / f"{mod['path'].stem}_rus{mod['path'].suffix}"
-                if mm.pack_mod(extracted, out_path, backup=False):
-                    ok += 1
-                self.update_idletasks()
-            except Exception as e:
-                fail += 1
-                self.update_idletasks()
-        messagebox.showinfo("Пакетный перевод", f"Готово. Успешно: {ok}, ошибок: {fail}.")
+                event = self._batch_queue.get_nowait()
+            except queue.Empty:
+                break
+            kind = event[0]
+            if kind == "progress":
+                text = f"Распаковка: {event[1]} / {event[2]}"
+            elif kind == "translate":
+                text = f"Перевод строк: {event[1]} / {event[2]}"
+            elif kind == "done":
+                text = f"Собран: {event[1]}" if event[2] else f"Не собран: {event[1]}"
+            elif kind == "error":
+                text = f"Ошибка: {event[1]}"
+            elif kind == "finished":
+                ok, fail = event[1], event[2]
+                self.btn_batch.configure(state="normal")
+                self.btn_batch_cancel.configure(state="disabled")
+                self.batch_label.configure(text="")
+                self._batch_thread = None
+                messagebox.showinfo("Пакетный перевод", f"Готово. Успешно: {ok}, ошибок: {fail}.")
+                self._refresh_list()
+                return
+        if text is not None:
+            self.batch_label.configure(text=text)
+        self.after(100, self._drain_batch_queue)
 
     def _open_translate(self, mod: dict, extracted_path: Path | None):
         if extracted_path and extracted_path.is_dir():
@@ -449,16 +467,22 @@ class App(ctk.CTk):
 
     def _open_translate_extracted(self, ext: dict):
         name = ext["name"]
+        # Один проход по папке: точное совпадение имени важнее совпадения по подстроке
         archive = None
-        for p in self.mods_path.iterdir():
-            if p.suffix.lower() in (".jar", ".zip") and mm.safe_mod_name(p.stem) == name:
-                archive = p
-                break
-        if not archive:
-            for p in self.mods_path.iterdir():
-                if p.suffix.lower() in (".jar", ".zip") and name.replace("_", "-") in p.stem:
-                    archive = p
+        fallback = None
+        alt = name.replace("_", "-")
+        with os.scandir(self.mods_path) as it:
+            for de in it:
+                nm = de.name.lower()
+                if not (nm.endswith(".jar") or nm.endswith(".zip")) or not de.is_file():
+                    continue
+                stem = de.name.rsplit(".", 1)[0]
+                if mm.safe_mod_name(stem) == name:
+                    archive = Path(de.path)
                     break
+                if fallback is None and alt in stem:
+                    fallback = Path(de.path)
+        archive = archive or fallback
         mod = {"path": archive or (self.mods_path / f"{name}.jar"), "name": name, "type": "jar", "manifest": None}
         self._open_translate(mod, ext["path"])
 
@@ -470,16 +494,10 @@ class App(ctk.CTk):
         self.frame_list.pack_forget()
         self.frame_translate.pack(fill="both", expand=True)
         self.geometry(f"{SIZE_TRANSLATE[0]}x{SIZE_TRANSLATE[1]}")
-        self._translate_rows.clear()
-        for w in self._translate_entries:
-            w.destroy()
-        self._translate_entries.clear()
-        self._translate_row_frames.clear()
-        for w in self.translate_scroll.winfo_children():
-            w.destroy()
+        self._translate_rows = []
+        self._apply_search_filter()
         self.progress_label.configure(text="")
-        ctk.CTkLabel(self.translate_scroll, text="Нажмите «Загрузить строки» — список текстов подгрузится, совпадения из памяти подставятся.",
-                     text_color=("gray50", "gray70")).pack(anchor="w")
+        self.translate_info.configure(text="Нажмите «Загрузить строки» — список текстов подгрузится, совпадения из памяти подставятся.")
 
     def _back_to_list(self):
         self.frame_translate.pack_forget()
@@ -493,76 +511,102 @@ class App(ctk.CTk):
         if not self._translate_extracted_path or not self._translate_extracted_path.is_dir():
             messagebox.showwarning("Внимание", "Сначала выберите мод и нажмите «Перевести».")
             return
-        for w in self._translate_entries:
-            w.destroy()
-        self._translate_entries.clear()
-        self._translate_row_frames.clear()
         self._translate_rows = tm.collect_all_strings(self._translate_extracted_path)
-        memory = _load_translation_memory(self.mods_path)
+        memory = self._get_memory()
         for r in self._translate_rows:
             if r["source"] in memory:
                 r["translated"] = memory[r["source"]]
-        for w in self.translate_scroll.winfo_children():
-            w.destroy()
-        if not self._translate_rows:
-            ctk.CTkLabel(self.translate_scroll, text="Строк не найдено.", text_color=("gray50", "gray70")).pack(anchor="w")
-            return
-        ctk.CTkLabel(self.translate_scroll, text=f"Найдено строк: {len(self._translate_rows)}. Поиск и фильтр выше. Заполните перевод или «Перевести все».",
-                     font=("", 11), text_color=("gray60", "gray75")).pack(anchor="w", pady=(0, 8))
-        for r in self._translate_rows:
-            row_f = ctk.CTkFrame(self.translate_scroll, fg_color=("gray92", "gray28"), corner_radius=6, height=40)
-            row_f.pack(fill="x", pady=2)
-            row_f.pack_propagate(False)
-            row_f_inner = ctk.CTkFrame(row_f, fg_color="transparent")
-            row_f_inner.pack(fill="both", expand=True, padx=10, pady=6)
-            src = (r.get("source") or "")[:55] + ("…" if len((r.get("source") or "")) > 55 else "")
-            ctk.CTkLabel(row_f_inner, text=src, width=360, anchor="w", wraplength=350).pack(side="left", padx=(0, 10))
-            e = ctk.CTkEntry(row_f_inner, width=380, placeholder_text="перевод", height=28)
-            if r.get("translated"):
-                e.insert(0, r["translated"])
-            e.pack(side="left", fill="x", expand=True, padx=4)
-            e.bind("<KeyRelease>", lambda *a: self._update_progress_label())
-            self._translate_entries.append(e)
-            self._translate_row_frames.append(row_f)
+            r["src_lower"] = (r.get("source") or "").lower()
+        if self._translate_rows:
+            self.translate_info.configure(text=f"Найдено строк: {len(self._translate_rows)}. Поиск и фильтр выше. Заполните перевод или «Перевести все».")
+        else:
+            self.translate_info.configure(text="Строк не найдено.")
+        self._recount_filled()
         self._apply_search_filter()
 
     def _translate_all(self):
-        if not self._translate_rows or len(self._translate_entries) != len(self._translate_rows):
+        if self._translate_thread and self._translate_thread.is_alive():
+            return
+        if not self._translate_rows:
             messagebox.showwarning("Внимание", "Сначала загрузите строки.")
             return
-        try:
-            from deep_translator import GoogleTranslator
-        except ImportError:
+        if not core.translator_available():
             messagebox.showerror("Ошибка", "Установите: pip install deep-translator")
             return
         src_lang = self._translate_source_lang
         tgt_lang = self._translate_target_lang
         total = len(self._translate_rows)
-        ok, fail, done = 0, 0, 0
-        last_error = None
-        memory = _load_translation_memory(self.mods_path)
-        for r, e in zip(self._translate_rows, self._translate_entries):
-            if (e.get() or "").strip():
-                done += 1
+        memory = self._get_memory()
+        core.prime_segment_cache(memory, src_lang, tgt_lang)
+        # Сначала собираем все пустые строки, затем переводим их пачками
+        pending: list[tuple[dict, str]] = []
+        for r in self._translate_rows:
+            if (r.get("translated") or "").strip():
                 continue
             src = (r.get("source") or "").strip()
-            if not src:
-                continue
-            self.progress_label.configure(text=f"Перевод: {done + ok + fail} / {total}")
-            self.update_idletasks()
-            tr, err = _auto_translate(src, src_lang, tgt_lang, memory=memory)
+            if src:
+                pending.append((r, src))
+        already = total - len(pending)
+        self.btn_translate_all.configure(state="disabled")
+        self.btn_translate_retry.configure(state="disabled")
+        self.progress_label.configure(text=f"Перевод: {already} / {total}")
+        self._translate_queue = queue.Queue()
+        self._translate_thread = threading.Thread(
+            target=self._translate_worker,
+            args=([src for _, src in pending], src_lang, tgt_lang, memory, self._translate_queue),
+            daemon=True,
+        )
+        self._translate_thread.start()
+        self.after(100, self._drain_translate_queue, pending, already, total)
+
+    def _translate_worker(self, texts: list[str], src_lang: str, tgt_lang: str,
+                          memory: core.TranslationMemory, q: queue.Queue):
+        """Перевод строк окна в фоновом потоке: ("progress", n), в конце ("finished", результаты)."""
+        results = [(None, None)] * len(texts)
+        try:
+            results = core.translate_many(texts, src_lang, tgt_lang, memory=memory,
+                                          on_progress=lambda n: q.put(("progress", n)))
+        except Exception as e:
+            results = [(None, str(e))] * len(texts)
+        finally:
+            memory.save()
+            q.put(("finished", results))
+
+    def _drain_translate_queue(self, pending: list[tuple[dict, str]], already: int, total: int):
+        """Обновляет прогресс и по завершении подставляет переводы (только из главного потока)."""
+        done = None
+        while True:
+            try:
+                event = self._translate_queue.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress":
+                done = event[1]
+            elif event[0] == "finished":
+                self._finish_translate_all(pending, event[1])
+                return
+        if done is not None:
+            self.progress_label.configure(text=f"Перевод: {already + done} / {total}")
+        self.after(100, self._drain_translate_queue, pending, already, total)
+
+    def _finish_translate_all(self, pending: list[tuple[dict, str]], results: list[tuple[str | None, str | None]]):
+        ok, fail = 0, 0
+        last_error = None
+        for (r, _), (tr, err) in zip(pending, results):
             if err:
                 last_error = err
             if tr:
-                e.delete(0, "end")
-                e.insert(0, tr)
+                # Пока шёл перевод, строку могли заполнить вручную — её не трогаем
+                if not (r.get("translated") or "").strip():
+                    r["translated"] = tr
                 ok += 1
             else:
                 fail += 1
-            done += 1
-            time.sleep(0.2)
-        _save_translation_memory(self.mods_path, memory)
-        self._update_progress_label()
+        self._translate_thread = None
+        self.btn_translate_all.configure(state="normal")
+        self.btn_translate_retry.configure(state="normal")
+        self._render_translate_rows(force=True)
+        self._recount_filled()
         msg = f"Переведено: {ok}."
         if fail:
             msg += f" Не удалось: {fail}."
@@ -574,20 +618,19 @@ class App(ctk.CTk):
         if not self._translate_mod or not self._translate_extracted_path:
             messagebox.showwarning("Внимание", "Нет открытого мода.")
             return
-        if not self._translate_rows or len(self._translate_entries) != len(self._translate_rows):
+        if not self._translate_rows:
             messagebox.showwarning("Внимание", "Сначала загрузите строки.")
             return
-        for r, e in zip(self._translate_rows, self._translate_entries):
-            r["translated"] = e.get().strip()
-        memory = _load_translation_memory(self.mods_path)
         for r in self._translate_rows:
-            if (r.get("translated") or "").strip():
-                memory[r["source"]] = r["translated"]
-        _save_translation_memory(self.mods_path, memory)
+            r["translated"] = (r.get("translated") or "").strip()
+        memory = self._get_memory()
+        memory.put_many((r["source"], r["translated"]) for r in self._translate_rows
+                        if (r.get("translated") or "").strip())
+        memory.save()
         tm.save_all_translations(self._translate_extracted_path, self._translate_rows)
         orig = self._translate_mod["path"]
         out_path = orig.parent / f"{orig.stem}_rus{orig.suffix}"
-        if mm.pack_mod(self._translate_extracted_path, out_path, backup=False):
+        if mm.pack_mod(self._translate_extracted_path, out_path, backup=False, source_archive=orig):
             if self._translate_cleanup_after_pack.get() and self._translate_extracted_path.is_dir():
                 try:
                     shutil.rmtree(self._translate_extracted_path)
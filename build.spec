@@ -10,7 +10,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=['customtkinter', 'PIL', 'PIL._tkinter_finder', 'deep_translator', 'mod_manager', 'translation_manager'],
+    hiddenimports=['customtkinter', 'PIL', 'PIL._tkinter_finder', 'deep_translator', 'aiohttp', 'orjson', 'requests', 'core', 'mod_manager', 'translate_backend', 'translation_manager'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
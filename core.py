@@ -0,0 +1,545 @@
+# -*- coding: utf-8 -*-
+"""
+Ядро перевода без GUI: конфиг, память переводов, пакетный перевод строк и модов.
+Используется окном (app.py) и из командной строки:  python core.py --batch <папка с модами>
+"""
+import argparse
+import hashlib
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Iterator, MutableMapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from pathlib import Path
+from typing import Callable
+import mod_manager as mm
+import translate_backend
+import translation_manager as tm
+
+try:
+    from deep_translator import GoogleTranslator, MyMemoryTranslator
+except ImportError:
+    GoogleTranslator = MyMemoryTranslator = None
+
+
+def _get_base_path() -> Path:
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().parent
+    return Path(__file__).resolve().parent
+
+
+CONFIG_PATH = _get_base_path() / "app_config.json"
+
+
+def load_config() -> dict:
+    if CONFIG_PATH.exists():
+        try:
+            return tm.read_json(CONFIG_PATH)
+        except Exception:
+            pass
+    return {}
+
+
+def save_config(data: dict) -> None:
+    try:
+        tm.write_json(CONFIG_PATH, data)
+    except Exception:
+        pass
+
+
+def translation_memory_path(mods_path: Path) -> Path:
+    return mods_path / "tm.sqlite"
+
+
+class TranslationMemory(MutableMapping):
+    """
+    Память переводов: SQLite-база в папке модов, ключ — md5 исходной строки.
+    Все записи держатся в словаре (поиск — обычный dict), новые и изменённые
+    пишутся в базу одной транзакцией при save().
+    Если базы ещё нет, переносит старый translation_memory.json и после записи
+    переименовывает его в translation_memory.json.migrated.
+    """
+
+    def __init__(self, mods_path: Path):
+        self.path = translation_memory_path(mods_path)
+        self._cache: dict[str, str] = {}
+        self._pending: dict[str, str] = {}
+        self._legacy: Path | None = None
+        # Память общая для окна перевода и фонового пакетного перевода
+        self._lock = threading.Lock()
+        existed = self.path.exists()
+        try:
+            with closing(self._connect()) as conn:
+                self._cache = dict(conn.execute("SELECT src, tgt FROM tm"))
+        except sqlite3.Error:
+            pass
+        if not existed:
+            self._migrate_json(mods_path / "translation_memory.json")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tm ("
+            "hash BLOB PRIMARY KEY, src TEXT, tgt TEXT, ts INTEGER)"
+        )
+        return conn
+
+    def _migrate_json(self, legacy: Path) -> None:
+        if not legacy.exists():
+            return
+        try:
+            data = tm.read_json(legacy)
+        except Exception:
+            return
+        if isinstance(data, dict):
+            self._legacy = legacy
+            self.put_many((k, v) for k, v in data.items() if isinstance(k, str) and isinstance(v, str) and v)
+            self.save()
+
+    def __getitem__(self, src: str) -> str:
+        return self._cache[src]
+
+    def __setitem__(self, src: str, tgt: str) -> None:
+        if self._cache.get(src) != tgt:
+            with self._lock:
+                self._cache[src] = tgt
+                self._pending[src] = tgt
+
+    def __delitem__(self, src: str) -> None:
+        with self._lock:
+            del self._cache[src]
+            self._pending.pop(src, None)
+
+    def __contains__(self, src: object) -> bool:
+        return src in self._cache
+
+    def __iter__(self) -> Iterator[str]:
+        # Снимок ключей: словарь могут пополнять из другого потока
+        with self._lock:
+            return iter(list(self._cache))
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, src: str, default: str | None = None) -> str | None:
+        return self._cache.get(src, default)
+
+    def put_many(self, pairs) -> None:
+        for src, tgt in pairs:
+            self[src] = tgt
+
+    def save(self) -> None:
+        """Записывает накопленные изменения в базу одной транзакцией."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        ts = int(time.time())
+        rows = [(hashlib.md5(src.encode("utf-8")).digest(), src, tgt, ts)
+                for src, tgt in pending.items()]
+        try:
+            with closing(self._connect()) as conn:
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO tm (hash, src, tgt, ts) VALUES (?, ?, ?, ?)", rows)
+        except sqlite3.Error:
+            with self._lock:
+                self._pending = {**pending, **self._pending}
+            return
+        # Старый JSON перенесён — убираем, чтобы он не импортировался повторно
+        if self._legacy is not None:
+            try:
+                self._legacy.replace(self._legacy.with_name(self._legacy.name + ".migrated"))
+            except OSError:
+                pass
+            self._legacy = None
+
+
+# Экземпляры переводчиков по потокам: deep_translator хранит параметры запроса в полях объекта,
+# поэтому один объект на несколько потоков делить нельзя
+_translators = threading.local()
+
+
+def _translator(cls, source_lang: str, target_lang: str):
+    """Переиспользуемый переводчик cls(source, target) для текущего потока."""
+    cache = getattr(_translators, "cache", None)
+    if cache is None:
+        cache = _translators.cache = {}
+    key = (cls, source_lang, target_lang)
+    tr = cache.get(key)
+    if tr is None:
+        tr = cache[key] = cls(source=source_lang, target=target_lang)
+    return tr
+
+
+def _basic_translate(text: str, source_lang: str = "en", target_lang: str = "ru",
+                     batch: bool = False) -> tuple[str | None, str | None]:
+    """
+    Базовый перевод без обработки тегов.
+    batch=True — склеенная пачка: в MyMemory не отправляется (он обрезает текст до 500 символов,
+    и пачка обратно не разделится).
+    """
+    text = (text or "").strip()
+    if not text:
+        return None, None
+    if len(text) > 4500:
+        text = text[:4500]
+    err = None
+    # Google напрямую через общую HTTP-сессию (соединение не открывается заново на каждый вызов)
+    if translate_backend.sync_available():
+        for src in (source_lang, "auto"):
+            try:
+                out = translate_backend.translate(text, src, target_lang)
+                if out:
+                    return out, None
+            except Exception as e:
+                if not err:
+                    err = str(e)
+    if GoogleTranslator is None:
+        return None, err or "Установите: pip install deep-translator"
+    text_short = text[:500] if len(text) > 500 else text
+    # Запасной путь: deep_translator — Google (если прямой запрос недоступен), затем MyMemory (короткий текст)
+    attempts = [] if batch else [(MyMemoryTranslator, source_lang, text_short), (MyMemoryTranslator, "auto", text_short)]
+    if not translate_backend.sync_available():
+        attempts[:0] = [(GoogleTranslator, source_lang, text), (GoogleTranslator, "auto", text)]
+    for cls, src, payload in attempts:
+        try:
+            out = _translator(cls, src, target_lang).translate(payload)
+            if out and out.strip():
+                return out.strip(), None
+        except Exception as e:
+            if not err:
+                err = str(e)
+    return None, err
+
+
+# Пакетный перевод: строки жадно склеиваются через разделитель в запросы до _BATCH_MAX_CHARS символов
+_BATCH_SEP = "\n⫷SEG⫸\n"
+_BATCH_SEP_RE = re.compile(r"\s*⫷\s*SEG\s*⫸\s*")
+_BATCH_MAX_CHARS = 4400
+# Параллельных запросов к переводчику (Google выдерживает ~5 запросов/с)
+_TRANSLATE_WORKERS = 5
+
+
+def _split_batches(texts: list[str]) -> list[list[int]]:
+    """Жадно группирует индексы строк в пачки, пока суммарная длина с разделителями не превысит _BATCH_MAX_CHARS."""
+    batches: list[list[int]] = []
+    cur: list[int] = []
+    size = 0
+    for i, t in enumerate(texts):
+        add = len(t) + len(_BATCH_SEP)
+        if cur and size + add > _BATCH_MAX_CHARS:
+            batches.append(cur)
+            cur, size = [], 0
+        cur.append(i)
+        size += add
+    if cur:
+        batches.append(cur)
+    return batches
+
+
+def _split_translated(out: str | None, count: int) -> list[str] | None:
+    """Разбивает перевод склеенной пачки обратно на строки; None — если части не сошлись."""
+    if not out:
+        return None
+    parts = [p.strip() for p in _BATCH_SEP_RE.split(out.strip())]
+    if len(parts) != count or not all(parts):
+        return None
+    return parts
+
+
+def _translate_chunk(texts: list[str], source_lang: str, target_lang: str,
+                     cancelled: Callable[[], bool] | None = None) -> list[tuple[str | None, str | None]]:
+    """
+    Одна пачка — один HTTP-запрос. Если перевод пришёл, но число частей не совпало
+    (разделитель испорчен), пачка делится пополам и каждая половина переводится заново —
+    так плохая строка изолируется за O(log n) запросов, а остальные всё равно уходят пачками.
+    Если запрос не удался (сеть, 429), пачка не делится: ошибка возвращается для всех строк.
+    """
+    if len(texts) == 1:
+        res = _basic_translate(texts[0], source_lang, target_lang)
+        time.sleep(0.2)
+        return [res]
+    out, err = _basic_translate(_BATCH_SEP.join(texts), source_lang, target_lang, batch=True)
+    time.sleep(0.2)
+    if not out:
+        return [(None, err)] * len(texts)
+    parts = _split_translated(out, len(texts))
+    if parts:
+        return [(p, None) for p in parts]
+    if cancelled and cancelled():
+        return [(None, None)] * len(texts)
+    mid = len(texts) // 2
+    return (_translate_chunk(texts[:mid], source_lang, target_lang, cancelled)
+            + _translate_chunk(texts[mid:], source_lang, target_lang, cancelled))
+
+
+def _basic_translate_batch(texts: list[str], source_lang: str = "en", target_lang: str = "ru",
+                           on_progress: Callable[[int], None] | None = None,
+                           cancelled: Callable[[], bool] | None = None) -> list[tuple[str | None, str | None]]:
+    """
+    Базовый перевод списка строк: одна пачка — один HTTP-запрос.
+    Сначала все пачки уходят асинхронно через translate_backend (если есть aiohttp),
+    неудавшиеся переводятся через deep_translator в пуле потоков (Google → MyMemory).
+    on_progress(n) вызывается в потоке вызывающего по мере готовности каждой пачки.
+    cancelled() — отмена: новые пачки не отправляются, ждать оставшиеся не нужно,
+    непереведённые строки остаются (None, None).
+    """
+    texts = [(t or "").strip() for t in texts]
+    results: list[tuple[str | None, str | None]] = [(None, None)] * len(texts)
+    idx = [i for i, t in enumerate(texts) if t]
+    batches = [[idx[j] for j in batch] for batch in _split_batches([texts[i] for i in idx])]
+    if not batches:
+        return results
+    done = 0
+    retry = batches
+    if translate_backend.available():
+        # Готовые пачки приходят из фонового цикла по одной — прогресс виден сразу, а не после всех
+        ready: queue.SimpleQueue = queue.SimpleQueue()
+        future = translate_backend.submit(
+            [_BATCH_SEP.join(texts[i] for i in items) for items in batches], source_lang, target_lang,
+            on_done=lambda k, out: ready.put((k, out)),
+        )
+        waiting = set(range(len(batches)))
+        retry = []
+        while waiting:
+            if cancelled and cancelled():
+                future.cancel()
+                return results
+            try:
+                k, out = ready.get(timeout=0.1)
+            except queue.Empty:
+                # Цикл упал, не отдав часть пачек, — их переводит запасной путь ниже
+                if future.done() and ready.empty():
+                    break
+                continue
+            waiting.discard(k)
+            items = batches[k]
+            parts = _split_translated(out, len(items))
+            if not parts:
+                retry.append(items)
+                continue
+            for i, part in zip(items, parts):
+                results[i] = part, None
+            done += len(items)
+            if on_progress:
+                on_progress(done)
+        retry.extend(batches[k] for k in sorted(waiting))
+    if not retry or (cancelled and cancelled()):
+        return results
+    ex = ThreadPoolExecutor(max_workers=_TRANSLATE_WORKERS)
+    stopped = False
+    try:
+        futures = {ex.submit(_translate_chunk, [texts[i] for i in items], source_lang, target_lang, cancelled): items
+                   for items in retry}
+        waiting = set(futures)
+        while waiting:
+            if cancelled and cancelled():
+                stopped = True
+                break
+            finished, waiting = wait(waiting, timeout=0.1, return_when=FIRST_COMPLETED)
+            for f in finished:
+                items = futures[f]
+                for i, res in zip(items, f.result()):
+                    results[i] = res
+                done += len(items)
+                if on_progress:
+                    on_progress(done)
+    finally:
+        # При отмене не ждём уже идущие запросы, ещё не начатые пачки снимаются
+        ex.shutdown(wait=not stopped, cancel_futures=True)
+    return results
+
+
+# Глобальный кэш сегментов для ускорения перевода: (исходный язык, целевой язык, сегмент) -> перевод
+_segment_cache: dict[tuple[str, str, str], str] = {}
+# Перевод идёт из нескольких потоков — кэш сегментов и память переводов меняем под блокировкой
+_memory_lock = threading.Lock()
+
+
+def prime_segment_cache(memory: MutableMapping[str, str], source_lang: str, target_lang: str) -> None:
+    """Переносит память переводов в кэш сегментов, чтобы при переводе хватало одного поиска."""
+    with _memory_lock:
+        _segment_cache.update(((source_lang, target_lang, k), v) for k, v in memory.items())
+
+
+def translate_many(texts: list[str], source_lang: str = "en", target_lang: str = "ru",
+                    memory: MutableMapping[str, str] | None = None,
+                    on_progress: Callable[[int], None] | None = None,
+                    cancelled: Callable[[], bool] | None = None) -> list[tuple[str | None, str | None]]:
+    """
+    Перевод списка строк. Совпадения из памяти подставляются сразу.
+    Строки без разметки и текстовые сегменты строк с тегами собираются в один список
+    уникальных фрагментов и переводятся пачками (_basic_translate_batch);
+    строки с тегами затем собираются через smart_translate из готовых переводов.
+    on_progress(n) получает примерное число готовых строк.
+    cancelled() — отмена: уже полученные переводы сохраняются, остальные строки остаются (None, None).
+    """
+    texts = [(t or "").strip() for t in texts]
+    results: list[tuple[str | None, str | None]] = [(None, None)] * len(texts)
+    plain: list[int] = []
+    marked: list[tuple[int, list[tuple[str, bool]]]] = []
+    done = 0
+    for i, t in enumerate(texts):
+        if not t:
+            continue
+        if memory and t in memory:
+            results[i] = memory[t], None
+            done += 1
+            continue
+        segments = tm.parse_tagged_text(t)
+        if any(is_tag for _, is_tag in segments):
+            marked.append((i, segments))
+        else:
+            plain.append(i)
+    # Уникальные фрагменты: целые строки без тегов + сегменты строк с тегами, которых нет в кэше
+    need: dict[str, None] = {}
+    for i in plain:
+        need[texts[i]] = None
+    for _, segments in marked:
+        for seg, is_tag in segments:
+            seg = seg.strip()
+            if not is_tag and seg and (source_lang, target_lang, seg) not in _segment_cache:
+                need[seg] = None
+    unique = list(need)
+    work = len(plain) + len(marked)
+    base = done
+    translated = dict(zip(unique, _basic_translate_batch(
+        unique, source_lang, target_lang,
+        on_progress=(lambda n: on_progress(base + n * work // len(unique))) if on_progress else None,
+        cancelled=cancelled,
+    )))
+    with _memory_lock:
+        for src, (tr, _) in translated.items():
+            if tr:
+                _segment_cache[(source_lang, target_lang, src)] = tr
+                if memory is not None:
+                    memory[src] = tr
+    for i in plain:
+        results[i] = translated[texts[i]]
+    if cancelled and cancelled():
+        return results
+
+    def lookup(seg: str) -> tuple[str | None, str | None]:
+        cached = _segment_cache.get((source_lang, target_lang, seg))
+        if cached is not None:
+            return cached, None
+        return _basic_translate(seg, source_lang, target_lang)
+
+    # Переведённые пачкой фрагменты — готовый кэш сегментов; промахи пополняют его,
+    # так что сегмент, не попавший в пачку, запрашивается один раз на все строки
+    for i, segments in marked:
+        tr, err = tm.smart_translate(texts[i], lookup, segments, cache=translated)
+        results[i] = tr, err
+        if tr and memory is not None:
+            with _memory_lock:
+                memory[texts[i]] = tr
+    if on_progress and work:
+        on_progress(base + work)
+    return results
+
+
+def translator_available() -> bool:
+    """Есть ли хоть один способ перевода: requests, aiohttp или deep-translator."""
+    return translate_backend.sync_available() or translate_backend.available() or GoogleTranslator is not None
+
+
+def batch_translate(mods_path: Path, mods: list[dict], memory: TranslationMemory,
+                    emit: Callable[[tuple], None],
+                    cancelled: Callable[[], bool] = lambda: False,
+                    source_lang: str = "en", target_lang: str = "ru") -> tuple[int, int]:
+    """
+    Пакетный перевод модов: распаковка → автоперевод → сохранение и сборка <имя>_rus.
+    О ходе работы сообщает через emit: ("progress", i, n), ("translate", i, n),
+    ("done", имя, успех), ("error", имя, текст). cancelled() — проверка отмены.
+    Возвращает (собрано, ошибок). Память переводов сохраняется в конце.
+    """
+    ok, fail = 0, 0
+    try:
+        prime_segment_cache(memory, source_lang, target_lang)
+        # 1) Распаковка и сбор строк всех модов
+        prepared: list[tuple[dict, Path, list[dict]]] = []
+        for i, mod in enumerate(mods):
+            if cancelled():
+                break
+            try:
+                extracted = mm.extract_mod(mod["path"], mods_path, mod["name"])
+                prepared.append((mod, extracted, tm.collect_all_strings(extracted)))
+            except Exception as e:
+                fail += 1
+                emit(("error", mod["name"], str(e)))
+            emit(("progress", i + 1, len(mods)))
+        # 2) Переводы, которые моды уже содержат (ru-RU .lang, ru_RU.json), — в память до машинного
+        #    перевода: их получат такие же строки других модов, а не перевод из сети
+        memory.put_many((r["source"], r["translated"]) for _, _, rows in prepared for r in rows
+                        if (r.get("translated") or "").strip())
+        # Уникальные непереведённые строки всех модов переводим один раз (общие «OK», «Cancel» и т.п.)
+        todo: dict[str, None] = {}
+        for _, _, rows in prepared:
+            for r in rows:
+                src = r["source"]
+                if src not in memory and not (r.get("translated") or "").strip():
+                    todo[src] = None
+        if todo and not cancelled():
+            emit(("translate", 0, len(todo)))
+            translate_many(list(todo), source_lang, target_lang, memory=memory,
+                           on_progress=lambda n: emit(("translate", n, len(todo))), cancelled=cancelled)
+        # 3) Подстановка переводов, сохранение и сборка каждого мода
+        for mod, extracted, rows in prepared:
+            if cancelled():
+                break
+            try:
+                # Заполняем только пустые — свой перевод мода не заменяем
+                for r in rows:
+                    if not (r.get("translated") or "").strip() and r["source"] in memory:
+                        r["translated"] = memory[r["source"]]
+                tm.save_all_translations(extracted, rows)
+                out_path = mod["path"].parent / f"{mod['path'].stem}_rus{mod['path'].suffix}"
+                packed = mm.pack_mod(extracted, out_path, backup=False, source_archive=mod["path"])
+                if packed:
+                    ok += 1
+                emit(("done", mod["name"], packed))
+            except Exception as e:
+                fail += 1
+                emit(("error", mod["name"], str(e)))
+    finally:
+        memory.save()
+    return ok, fail
+
+
+def _print_event(event: tuple) -> None:
+    kind = event[0]
+    if kind == "progress":
+        print(f"Распаковка: {event[1]} / {event[2]}")
+    elif kind == "translate":
+        print(f"Перевод строк: {event[1]} / {event[2]}")
+    elif kind == "done":
+        print(f"{event[1]}: {'собран' if event[2] else 'ошибка сборки'}")
+    elif kind == "error":
+        print(f"{event[1]}: {event[2]}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Пакетный перевод без окна: python core.py --batch <папка с модами>."""
+    parser = argparse.ArgumentParser(description="Hytale — перевод модов без GUI")
+    parser.add_argument("--batch", metavar="ПАПКА", required=True, type=Path,
+                        help="папка с модами (JAR/ZIP) для пакетного перевода")
+    args = parser.parse_args(argv)
+    mods_path = args.batch.resolve()
+    if not translator_available():
+        print("Установите: pip install deep-translator", file=sys.stderr)
+        return 2
+    mods = mm.scan_mods(mods_path)
+    if not mods:
+        print("Нет модов в папке.", file=sys.stderr)
+        return 1
+    ok, fail = batch_translate(mods_path, mods, TranslationMemory(mods_path), _print_event)
+    print(f"Готово: {ok}, ошибок: {fail}")
+    return 0 if not fail else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Прямой доступ к Google (translate.googleapis.com).
+- Асинхронно на aiohttp: одна сессия на пачку запросов, не более MAX_CONCURRENT одновременно.
+  Если aiohttp не установлен — available() возвращает False и используется deep_translator.
+- Синхронно (translate): общий requests.Session — TCP/TLS-соединения переиспользуются между вызовами.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    requests = None
+
+GOOGLE_URL = "https://translate.googleapis.com/translate_a/single"
+# Google выдерживает ~5 запросов/с
+MAX_CONCURRENT = 5
+TIMEOUT = 30
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+
+def available() -> bool:
+    return aiohttp is not None
+
+
+def sync_available() -> bool:
+    return requests is not None
+
+
+def _get_session():
+    """Общая сессия с пулом соединений (по размеру пула потоков перевода) и повторами."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8,
+                                  max_retries=Retry(total=2, backoff_factor=0.5))
+            _session.mount("https://", adapter)
+    return _session
+
+
+def translate(text: str, source_lang: str = "en", target_lang: str = "ru") -> str | None:
+    """Синхронный перевод одной строки через общую сессию. Ошибки сети/HTTP пробрасываются."""
+    params = {"client": "gtx", "sl": source_lang, "tl": target_lang, "dt": "t"}
+    resp = _get_session().post(GOOGLE_URL, params=params, data={"q": text}, timeout=TIMEOUT)
+    resp.raise_for_status()
+    return _parse_response(resp.json())
+
+
+def _parse_response(data: Any) -> str | None:
+    """Ответ вида [[["перевод", "исходник", ...], ...], ...] -> склеенный перевод."""
+    try:
+        out = "".join(part[0] for part in data[0] if part and part[0])
+    except (TypeError, IndexError, KeyError):
+        return None
+    return out.strip() or None
+
+
+async def _translate_one(session: "aiohttp.ClientSession", sem: asyncio.Semaphore,
+                         text: str, source_lang: str, target_lang: str) -> str | None:
+    params = {"client": "gtx", "sl": source_lang, "tl": target_lang, "dt": "t"}
+    async with sem:
+        try:
+            async with session.post(GOOGLE_URL, params=params, data={"q": text}) as resp:
+                if resp.status != 200:
+                    return None
+                data = await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return None
+    return _parse_response(data)
+
+
+async def translate_many(texts: list[str], source_lang: str = "en", target_lang: str = "ru",
+                         on_done: Callable[[int, str | None], None] | None = None) -> list[str | None]:
+    """
+    Переводит все строки параллельно; None — запрос не удался (вызывающий переводит запасным способом).
+    on_done(i, перевод) вызывается в фоновом цикле сразу по готовности каждой строки.
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+
+    async def one(session: "aiohttp.ClientSession", i: int, text: str) -> str | None:
+        out = await _translate_one(session, sem, text, source_lang, target_lang)
+        if on_done:
+            on_done(i, out)
+        return out
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=TIMEOUT)) as session:
+        return list(await asyncio.gather(*(one(session, i, t) for i, t in enumerate(texts))))
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Фоновый event loop в отдельном потоке — общий для всех вызовов."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="translate-loop", daemon=True).start()
+    return _loop
+
+
+def submit(texts: list[str], source_lang: str = "en", target_lang: str = "ru",
+           on_done: Callable[[int, str | None], None] | None = None) -> Future:
+    """Запускает translate_many в фоновом цикле из любого потока. on_done — см. translate_many."""
+    return asyncio.run_coroutine_threadsafe(translate_many(texts, source_lang, target_lang, on_done), _get_loop())
@@ -4,16 +4,73 @@
 Всё для работы внутри папки mods (распаковка в mods/.extracted/<mod>/).
 """
 import json
+import os
 import re
 import zipfile
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 JSON_TEXT_KEYS = frozenset({
     "name", "description", "title", "text", "displayName", "message", "lore",
     "display_name", "desc", "label", "hint", "placeholder",
 })
 
+# --- Чтение/запись файлов ---
+def read_json(p: Path) -> Any:
+    """
+    JSON из файла: orjson (C-расширение, читает байты напрямую), без него — стандартный json.
+    Что orjson не принимает (BOM, NaN и т.п.), дочитывает стандартный json как раньше.
+    """
+    if orjson is not None:
+        raw = p.read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return json.loads(raw.decode("utf-8"))
+    return json.loads(p.read_bytes().decode("utf-8"))
+
+
+def _dump_json(data: Any) -> bytes:
+    """JSON с отступом 2 и кириллицей как есть."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _write_if_changed(p: Path, data: bytes) -> bool:
+    """
+    Записывает файл, только если содержимое отличается от того, что уже на диске.
+    Запись атомарная, как в pack_mod: временный .tmp рядом и os.replace — недописанного файла не остаётся.
+    Возвращает True, если файл был записан.
+    """
+    try:
+        if p.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    tmp = p.with_name(p.name + ".tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, p)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def write_json(p: Path, data: Any) -> bool:
+    """Записывает JSON (см. _dump_json), если он изменился."""
+    return _write_if_changed(p, _dump_json(data))
+
+
 # --- Умный перевод с сохранением тегов ---
 
 # Паттерн для разбиения текста на теги и обычный текст
@@ -36,44 +93,37 @@ def parse_tagged_text(text: str) -> list[tuple[str, bool]]:
     """
     if not text:
         return []
-    
-    result = []
-    last_end = 0
-    
-    for m in _TAG_PATTERN.finditer(text):
-        # Текст до тега
-        if m.start() > last_end:
-            segment = text[last_end:m.start()]
-            if segment:
-                result.append((segment, False))
-        # Сам тег
-        result.append((m.group(0), True))
-        last_end = m.end()
-    
-    # Остаток текста после последнего тега
-    if last_end < len(text):
-        segment = text[last_end:]
-        if segment:
-            result.append((segment, False))
-    
-    return result
+    # Группа в паттерне: split отдаёт [текст, тег, текст, тег, ...] — теги на нечётных местах
+    return [(tok, bool(i & 1)) for i, tok in enumerate(_TAG_PATTERN.split(text)) if tok]
 
 
-def smart_translate(text: str, translate_func) -> tuple[str | None, str | None]:
+def smart_translate(text: str, translate_func,
+                    segments: list[tuple[str, bool]] | None = None,
+                    cache: dict[str, tuple[str | None, str | None]] | None = None) -> tuple[str | None, str | None]:
     """
     Переводит текст, сохраняя теги <color>, <item>, [TMP], \\n и т.д.
     
     translate_func(text) -> (translated, error) — функция перевода.
+    segments — уже готовый результат parse_tagged_text(text), чтобы не разбирать текст повторно.
+    cache — {сегмент: (translated, error)}, общий для нескольких вызовов: повторяющиеся
+    сегменты («Damage», «Health») переводятся один раз. Пополняется результатами translate_func.
     
     Возвращает (переведённый_текст, ошибка).
     """
     if not text or not text.strip():
         return None, None
     
-    segments = parse_tagged_text(text)
+    if segments is None:
+        segments = parse_tagged_text(text)
     
-    # Если тегов нет — обычный перевод
-    if all(is_tag for _, is_tag in segments) or not any(is_tag for _, is_tag in segments):
+    # Если тегов нет (или только теги) — обычный перевод
+    has_tag = has_text = False
+    for _, is_tag in segments:
+        if is_tag:
+            has_tag = True
+        else:
+            has_text = True
+    if not (has_tag and has_text):
         return translate_func(text)
     
     # Собираем только текстовые сегменты для перевода
@@ -92,7 +142,12 @@ def smart_translate(text: str, translate_func) -> tuple[str | None, str | None]:
         if not seg_clean:
             continue
         
-        tr, err = translate_func(seg_clean)
+        hit = cache.get(seg_clean) if cache is not None else None
+        if hit is None:
+            hit = translate_func(seg_clean)
+            if cache is not None:
+                cache[seg_clean] = hit
+        tr, err = hit
         if tr:
             # Сохраняем пробелы в начале и конце
             leading = seg[:len(seg) - len(seg.lstrip())]
@@ -108,15 +163,11 @@ def smart_translate(text: str, translate_func) -> tuple[str | None, str | None]:
     return result, error
 
 
-def has_markup(text: str) -> bool:
-    """Проверяет, содержит ли текст разметку (теги, переносы и т.д.)."""
-    if not text:
-        return False
-    return bool(_TAG_PATTERN.search(text))
+_UNSAFE_CHARS = re.compile(r"[^\w.\-]")
 
 
 def _safe_name(name: str) -> str:
-    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+    return _UNSAFE_CHARS.sub("_", name)
 
 
 def _is_translation_key(text: str) -> bool:
@@ -135,6 +186,10 @@ def _is_translation_key(text: str) -> bool:
     return True
 
 
+# Шаблоны подстановки одним проходом: {var} (где-то в строке есть и «}»), %s/%d/%(, «_ }» и «{ _»
+_PLACEHOLDER_RE = re.compile(r"\{[a-zA-Z_%].*\}|\}.*\{[a-zA-Z_%]|%[sd(]|_\s*\}|\{\s*_", re.DOTALL)
+
+
 def _should_skip_source(text: str) -> bool:
     """
     Отсеивать строки, которые не нужно переводить.
@@ -148,11 +203,7 @@ def _should_skip_source(text: str) -> bool:
         return True
     s = text.strip()
     # Шаблоны подстановки — ломаются при переводе
-    if "{" in s and "}" in s and re.search(r"\{[a-zA-Z_%]", s):
-        return True
-    if "%s" in s or "%d" in s or "%(" in s:
-        return True
-    if re.search(r"_\s*}", s) or re.search(r"\{\s*_", s):
+    if _PLACEHOLDER_RE.search(s):
         return True
     if not s.replace("_", "").replace(" ", "").replace("\n", ""):
         return True
@@ -160,13 +211,9 @@ def _should_skip_source(text: str) -> bool:
     if " " not in s and "\n" not in s and "_" in s and all(c.isalnum() or c == "_" for c in s):
         return True
     # Слитые повторяющиеся слова (AliveAlive, TestTest)
-    if " " not in s and "\n" not in s and len(s) >= 2 and s.isalpha():
-        for n in range(1, len(s) // 2 + 1):
-            if len(s) % n != 0:
-                continue
-            part = s[:n]
-            if part * (len(s) // n) == s:
-                return True
+    # Строка — повтор своего префикса ⇔ она встречается в s+s раньше позиции len(s)
+    if " " not in s and "\n" not in s and len(s) >= 2 and s.isalpha() and (s + s).find(s, 1) < len(s):
+        return True
     return False
 
 
@@ -183,10 +230,35 @@ def parse_lang_content(text: str) -> dict[str, str]:
     return result
 
 
+# путь -> ((mtime_ns, размер), разобранные записи) — один разбор на файл за сеанс, пока он не изменился
+_lang_cache: dict[Path, tuple[tuple[int, int], dict[str, str]]] = {}
+
+
+def _parse_lang_cached(p: Path) -> dict[str, str]:
+    """parse_lang_content для файла с кэшем. Возвращает общий словарь — не изменять, копировать."""
+    st = p.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _lang_cache.get(p)
+    if hit and hit[0] == stamp:
+        return hit[1]
+    entries = parse_lang_content(p.read_bytes().decode("utf-8"))
+    _lang_cache[p] = (stamp, entries)
+    return entries
+
+
 def lang_to_content(entries: dict[str, str], use_spaces: bool = False) -> str:
     """Формат key=value (как в оригинальных .lang Hytale) или key = value."""
     sep = " = " if use_spaces else "="
-    return "\n".join(f"{k}{sep}{v}" for k, v in sorted(entries.items()))
+    buf: list[str] = []
+    append = buf.append
+    for k, v in sorted(entries.items()):
+        append(k)
+        append(sep)
+        append(v)
+        append("\n")
+    if buf:
+        buf.pop()  # без перевода строки в конце, как раньше
+    return "".join(buf)
 
 
 def _extract_server_translation_keys(obj: Any) -> list[str]:
@@ -214,6 +286,19 @@ def _key_case_variant(key: str) -> str:
     return key
 
 
+def _add_case_aliases(entries: dict[str, str]) -> None:
+    """Дописывает в entries ключи другого регистра (benchcategories <-> benchCategories), которых ещё нет."""
+    aliases = {}
+    for k, v in entries.items():
+        # Меняет ключ только _key_case_variant для benchcategories. — остальные не трогаем
+        if "benchcategories." not in k.lower():
+            continue
+        alt = _key_case_variant(k)
+        if alt != k and alt not in entries and alt not in aliases:
+            aliases[alt] = v
+    entries.update(aliases)
+
+
 def _key_to_default_display_name(key: str) -> str:
     """Генерирует читаемое имя из ключа: items.Ingredient_Voidheart.name -> Voidheart."""
     base = key.replace(".name", "").replace(".description", "")
@@ -231,42 +316,46 @@ def _key_to_default_display_name(key: str) -> str:
 
 # --- Извлечение строк из .ui (Text: "...", @Text = "...") ---
 _UI_TEXT_PATTERN = re.compile(
-    r'(Text:\s*")([^"]*)(")|(@Text\s*=\s*")([^"]*)(")',
+    r'(?P<prefix>Text:\s*"|@Text\s*=\s*")(?P<val>[^"]*)(?P<suffix>")',
     re.MULTILINE
 )
 
 
 def extract_ui_strings(content: str) -> list[tuple[int, str]]:
     """Возвращает [(позиция_в_строке, строка), ...] для подстановки при сохранении."""
-    out = []
-    for m in _UI_TEXT_PATTERN.finditer(content):
-        if m.group(2) is not None:
-            out.append((m.start(), m.group(2)))
-        else:
-            out.append((m.start(), m.group(5)))
-    return out
+    return [(m.start(), m.group("val")) for m in _UI_TEXT_PATTERN.finditer(content)]
 
 
 def apply_ui_translations(content: str, replacements: list[tuple[str, str]]) -> str:
     """replacements = [(source, translated), ...]. Заменяет только значения в кавычках после Text: / @Text =."""
-    if not replacements:
+    # Первый непустой перевод для строки — как при прежнем переборе списка
+    repl_map = {src: tr for src, tr in reversed(replacements) if tr}
+    if not repl_map:
         return content
     def repl(m):
-        if m.group(2) is not None:
-            prefix, val, suffix = m.group(1), m.group(2), m.group(3)
-            for src, tr in replacements:
-                if val == src and tr:
-                    return prefix + tr + suffix
-            return m.group(0)
-        else:
-            prefix, val, suffix = m.group(4), m.group(5), m.group(6)
-            for src, tr in replacements:
-                if val == src and tr:
-                    return prefix + tr + suffix
-            return m.group(0)
+        tr = repl_map.get(m.group("val"))
+        return m.group("prefix") + tr + m.group("suffix") if tr else m.group(0)
     return _UI_TEXT_PATTERN.sub(repl, content)
 
 
+def _load_json_files(paths: list[Path]) -> dict[Path, Any]:
+    """
+    Разбирает файлы по порядку. Нечитаемые и null пропускаются.
+    Намеренно без пула процессов: файлы мелкие и разбор (orjson) быстрее, чем запуск воркеров —
+    на Windows и в exe каждый воркер заново импортирует app.py, а на Linux fork копирует
+    процесс с Tk, циклом asyncio и рабочими потоками.
+    """
+    result = {}
+    for p in paths:
+        try:
+            data = read_json(p)
+        except Exception:
+            continue
+        if data is not None:
+            result[p] = data
+    return result
+
+
 # --- Единый сбор всех строк для перевода ---
 def collect_all_strings(extracted_path: Path) -> list[dict]:
     """
@@ -283,7 +372,7 @@ def collect_all_strings(extracted_path: Path) -> list[dict]:
         if not f.is_file():
             continue
         try:
-            data = json.loads(f.read_text(encoding="utf-8"))
+            data = read_json(f)
             rel = f.relative_to(base).as_posix()
             if data.get("Name") and not _is_translation_key(data["Name"]) and not _should_skip_source(data["Name"]):
                 rows.append({"type": "manifest", "file_rel": rel, "key": "Name", "source": data["Name"], "translated": None})
@@ -299,19 +388,27 @@ def collect_all_strings(extracted_path: Path) -> list[dict]:
     # 2) Server/Languages/**/*.lang (en-US или первая локаль; ru-RU подставляем при сохранении)
     lang_root = base / "Server" / "Languages"
     lang_keys_seen: set[tuple[str, str]] = set()  # (rel, key)
+    # Для 2b: первый файл исходной локали и все её записи, все записи ru-RU — из этого же прохода
+    default_lang_rel = None
+    en_entries_all: dict[str, str] = {}
+    ru_entries_all: dict[str, str] = {}
     if lang_root.is_dir():
         ru_dir = lang_root / "ru-RU"
         ru_entries_by_file = {}
         if ru_dir.is_dir():
             for lf in ru_dir.glob("*.lang"):
-                ru_entries_by_file[lf.name] = parse_lang_content(lf.read_text(encoding="utf-8"))
+                ru_entries_by_file[lf.name] = _parse_lang_cached(lf)
+                ru_entries_all.update(ru_entries_by_file[lf.name])
         for loc_dir in sorted(lang_root.iterdir()):
             if not loc_dir.is_dir() or loc_dir.name == "ru-RU":
                 continue
             for lf in loc_dir.glob("*.lang"):
+                rel = lf.relative_to(base).as_posix()
+                if default_lang_rel is None:
+                    default_lang_rel = rel
                 try:
-                    entries = parse_lang_content(lf.read_text(encoding="utf-8"))
-                    rel = lf.relative_to(base).as_posix()
+                    entries = _parse_lang_cached(lf)
+                    en_entries_all.update(entries)
                     ru = ru_entries_by_file.get(lf.name, {})
                     for k, v in entries.items():
                         if not _is_translation_key(v) and not _should_skip_source(v):
@@ -322,33 +419,20 @@ def collect_all_strings(extracted_path: Path) -> list[dict]:
             break
 
     # 2b) Ключи server.xxx из JSON (TranslationProperties, Bench Categories и т.д.) — добавляем недостающие
-    default_lang_rel = None
-    en_entries_all: dict[str, str] = {}  # Все записи из en-US/*.lang
-    if lang_root.is_dir():
-        for loc_dir in sorted(lang_root.iterdir()):
-            if loc_dir.is_dir() and loc_dir.name != "ru-RU":
-                for lf in loc_dir.glob("*.lang"):
-                    if lf.exists():
-                        en_entries_all.update(parse_lang_content(lf.read_text(encoding="utf-8")))
-                        if default_lang_rel is None:
-                            default_lang_rel = lf.relative_to(base).as_posix()
-                break
+    # Один обход дерева: каждый JSON читается и разбирается один раз — для 2b и для раздела 5
+    parsed_json = _load_json_files([
+        jf for jf in base.rglob("*.json")
+        if jf.is_file() and "Languages" not in jf.parts and "Translations" not in jf.parts
+    ])
     if default_lang_rel:
-        for jf in base.rglob("*.json"):
-            if not jf.is_file() or "Languages" in jf.parts or "Translations" in jf.parts:
-                continue
+        for data in parsed_json.values():
             try:
-                data = json.loads(jf.read_text(encoding="utf-8"))
                 for key in _extract_server_translation_keys(data):
                     if (default_lang_rel, key) not in lang_keys_seen:
                         lang_keys_seen.add((default_lang_rel, key))
                         # Берём source из en-US, а не генерируем заглушку
                         src_val = en_entries_all.get(key) or en_entries_all.get(_key_case_variant(key)) or _key_to_default_display_name(key)
-                        ru_val = None
-                        if ru_dir.exists():
-                            for ru_lf in ru_dir.glob("*.lang"):
-                                ru_entries = parse_lang_content(ru_lf.read_text(encoding="utf-8"))
-                                ru_val = ru_entries.get(key) or ru_val or ru_entries.get(_key_case_variant(key))
+                        ru_val = ru_entries_all.get(key) or ru_entries_all.get(_key_case_variant(key))
                         # Не добавляем если source проблемный
                         if not _should_skip_source(src_val):
                             rows.append({"type": "lang", "file_rel": default_lang_rel, "key": key, "source": src_val, "translated": ru_val})
@@ -362,11 +446,11 @@ def collect_all_strings(extracted_path: Path) -> list[dict]:
             if jf.name.startswith("ru"):  # Пропускаем русские — целевые файлы
                 continue
             try:
-                data = json.loads(jf.read_text(encoding="utf-8"))
+                data = read_json(jf)
                 rel = jf.relative_to(base).as_posix()
                 if isinstance(data, dict):
                     ru_file = jf.parent / "ru_RU.json"
-                    ru_data = json.loads(ru_file.read_text(encoding="utf-8")) if ru_file.exists() else {}
+                    ru_data = read_json(ru_file) if ru_file.exists() else {}
                     for k, v in data.items():
                         if isinstance(v, str) and not _is_translation_key(v) and not _should_skip_source(v):
                             rows.append({"type": "common_json", "file_rel": rel, "key": k, "source": v, "translated": ru_data.get(k)})
@@ -386,7 +470,7 @@ def collect_all_strings(extracted_path: Path) -> list[dict]:
         if not uf.is_file():
             continue
         try:
-            content = uf.read_text(encoding="utf-8")
+            content = uf.read_bytes().decode("utf-8")
             rel = uf.relative_to(base).as_posix()
             for pos, s in extract_ui_strings(content):
                 if s.strip() and not _is_translation_key(s) and not _should_skip_source(s) and (rel, s) not in seen_ui:
@@ -396,11 +480,8 @@ def collect_all_strings(extracted_path: Path) -> list[dict]:
             pass
 
     # 5) Server/Languages уже выше; остальные JSON с name/description и т.д.
-    for jf in base.rglob("*.json"):
-        if not jf.is_file() or "Languages" in jf.parts or "Translations" in jf.parts:
-            continue
+    for jf, data in parsed_json.items():
         try:
-            data = json.loads(jf.read_text(encoding="utf-8"))
             rel = jf.relative_to(base).as_posix()
             for path_t, val in _json_find_text_paths(data, ()):
                 if isinstance(val, str) and val.strip() and not _is_translation_key(val) and not _should_skip_source(val):
@@ -412,18 +493,25 @@ def collect_all_strings(extracted_path: Path) -> list[dict]:
     return rows
 
 
-def _json_find_text_paths(obj: Any, path: tuple) -> list[tuple[tuple, str]]:
+def _json_find_text_paths(obj: Any, path: tuple = ()) -> list[tuple[tuple, str]]:
+    """Пары (путь, строка) для текстовых ключей в порядке обхода в глубину; без рекурсии — явный стек."""
     out = []
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            kl = k.lower() if isinstance(k, str) else k
-            if isinstance(k, str) and kl in JSON_TEXT_KEYS and isinstance(v, str):
-                out.append((path + (k,), v))
-            else:
-                out.extend(_json_find_text_paths(v, path + (k,)))
-    elif isinstance(obj, list):
-        for i, v in enumerate(obj):
-            out.extend(_json_find_text_paths(v, path + (i,)))
+    # (узел, путь, готовая строка?) — дети кладутся в обратном порядке, чтобы сохранить порядок обхода
+    stack: list[tuple[Any, tuple, bool]] = [(obj, path, False)]
+    while stack:
+        cur, cur_path, is_text = stack.pop()
+        if is_text:
+            out.append((cur_path, cur))
+        elif isinstance(cur, dict):
+            items = []
+            for k, v in cur.items():
+                is_key_text = isinstance(k, str) and isinstance(v, str) and k.lower() in JSON_TEXT_KEYS
+                if is_key_text or isinstance(v, (dict, list)):
+                    items.append((v, cur_path + (k,), is_key_text))
+            stack.extend(reversed(items))
+        elif isinstance(cur, list):
+            stack.extend(reversed([(v, cur_path + (i,), False) for i, v in enumerate(cur)
+                                   if isinstance(v, (dict, list))]))
     return out
 
 
@@ -504,7 +592,7 @@ def save_all_translations(extracted_path: Path, rows: list[dict]) -> None:
         p = base / rel
         if not p.exists():
             continue
-        data = json.loads(p.read_text(encoding="utf-8"))
+        data = read_json(p)
         for k, v in kv.items():
             if k == "Name":
                 data["Name"] = v
@@ -514,53 +602,47 @@ def save_all_translations(extracted_path: Path, rows: list[dict]) -> None:
                 idx = int(k.split("[")[1].split("]")[0])
                 if "Authors" in data and idx < len(data["Authors"]) and isinstance(data["Authors"][idx], dict):
                     data["Authors"][idx]["Name"] = v
-        p.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json(p, data)
 
     for ru_rel, entries in lang_by_file.items():
         ru_path = base / ru_rel
         # Объединяем с существующим ru-RU, чтобы не потерять переводы
         existing_ru = {}
         if ru_path.exists():
-            existing_ru = parse_lang_content(ru_path.read_text(encoding="utf-8"))
+            existing_ru = dict(_parse_lang_cached(ru_path))
         existing_ru.update(entries)
         # Алиасы для ключей с разным регистром (benchcategories <-> benchCategories)
-        for k, v in list(existing_ru.items()):
-            alt = _key_case_variant(k)
-            if alt != k and alt not in existing_ru:
-                existing_ru[alt] = v
+        _add_case_aliases(existing_ru)
         ru_path.parent.mkdir(parents=True, exist_ok=True)
         content = lang_to_content(existing_ru, use_spaces=False)
-        ru_path.write_text(content, encoding="utf-8")
+        _write_if_changed(ru_path, content.encode("utf-8"))
 
         # Дополняем en-US недостающими ключами (с исходным текстом на английском)
         src_rel = ru_rel.replace("ru-RU", "en-US")
         src_path = base / src_rel
         if src_path.exists() and src_rel != ru_rel:
-            existing_en = parse_lang_content(src_path.read_text(encoding="utf-8"))
+            existing_en = dict(_parse_lang_cached(src_path))
             sources = lang_sources.get(ru_rel, {})
             for k, src_text in sources.items():
                 if k not in existing_en and src_text:
                     existing_en[k] = src_text
-            for k, v in list(existing_en.items()):
-                alt = _key_case_variant(k)
-                if alt != k and alt not in existing_en:
-                    existing_en[alt] = v
-            src_path.write_text(lang_to_content(existing_en, use_spaces=False), encoding="utf-8")
+            _add_case_aliases(existing_en)
+            _write_if_changed(src_path, lang_to_content(existing_en, use_spaces=False).encode("utf-8"))
 
     for rel, pairs in ui_by_file.items():
         p = base / rel
         if not p.exists():
             continue
-        content = p.read_text(encoding="utf-8")
+        content = p.read_bytes().decode("utf-8")
         content = apply_ui_translations(content, pairs)
-        p.write_text(content, encoding="utf-8")
+        _write_if_changed(p, content.encode("utf-8"))
 
     for rel, kv in common_json_by_file.items():
         p = base / rel
         ru_path = p.parent / "ru_RU.json"
         existing = {}
         if ru_path.exists():
-            existing = json.loads(ru_path.read_text(encoding="utf-8"))
+            existing = read_json(ru_path)
         for key_path, val in kv.items():
             # Ключ вида "enchantments.sharpness.description" — первая часть категория, остальное подключ
             parts = key_path.split(".", 1)
@@ -571,16 +653,16 @@ def save_all_translations(extracted_path: Path, rows: list[dict]) -> None:
                 if cat not in existing or not isinstance(existing[cat], dict):
                     existing[cat] = {}
                 existing[cat][subkey] = val
-        ru_path.write_text(json.dumps(existing, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json(ru_path, existing)
 
     for rel, key_vals in json_by_file.items():
         p = base / rel
         if not p.exists():
             continue
-        data = json.loads(p.read_text(encoding="utf-8"))
+        data = read_json(p)
         for key_str, val in key_vals:
             _json_set_by_path(data, _key_str_to_path(key_str), val)
-        p.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json(p, data)
 
 
 # --- Работа с JAR/ZIP без распаковки (чтение .lang для совместимости) ---
@@ -588,11 +670,12 @@ def get_lang_files_from_archive(archive_path: Path) -> dict[str, dict[str, str]]
     result = {}
     try:
         with zipfile.ZipFile(archive_path, "r") as z:
-            for name in z.namelist():
-                n = name.replace("\\", "/")
-                if n.endswith(".lang"):
-                    with z.open(name) as f:
-                        result[n] = parse_lang_content(f.read().decode("utf-8", errors="replace"))
+            for zi in z.infolist():
+                # Фильтр по расширению до нормализации пути; читаем по ZipInfo — без повторного поиска имени
+                if not zi.filename.endswith(".lang"):
+                    continue
+                n = zi.filename.replace("\\", "/")
+                result[n] = parse_lang_content(z.read(zi).decode("utf-8", errors="replace"))
     except Exception:
         pass
     return result